@@ -1,4 +1,5 @@
 import os
+import glob
 import argparse
 import logging
 from dotenv import load_dotenv
@@ -6,6 +7,7 @@ from src.etl.youtube_api import YouTubeAPI
 from src.etl.s3_upload import S3Uploader
 from src.ml.openai_integration import OpenAIAnalyzer
 from src.ml.seo_suggestions import SEOSuggestions
+from src.storage.analytics_store import AnalyticsStore
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -47,20 +49,47 @@ def process_video(video_id, output_format='csv'):
         s3_uploader.upload_file(file_name)
         logger.info(f"Uploaded {file_name} to S3")
 
+        # Record a details snapshot and the comment history in the local analytics store.
+        # The store is a secondary output, so failures here must not abort ingestion.
+        try:
+            analytics_store = AnalyticsStore(sentiment_counter=SEOSuggestions.sentiment_counts)
+            analytics_store.record_video(video_id, video_details)
+            analytics_store.record_comments(video_id, comments_df)
+            logger.info(f"Recorded video {video_id} in analytics store {analytics_store.db_path}")
+        except Exception as e:
+            logger.warning(f"Failed to record video {video_id} in analytics store: {str(e)}")
+
         return video_details, comments_df
 
     except Exception as e:
         logger.error(f"Error processing video {video_id}: {str(e)}")
         raise
 
-def main(video_ids, output_format='csv'):
+def backfill_comments(directory):
+    # Import comment files written by earlier runs into the analytics store
+    analytics_store = AnalyticsStore(sentiment_counter=SEOSuggestions.sentiment_counts)
+    for pattern in ("*_YouTube_Comments.csv", "*_YouTube_Comments.json"):
+        for file_name in sorted(glob.glob(os.path.join(directory, pattern))):
+            video_id = os.path.basename(file_name).rsplit("_YouTube_Comments.", 1)[0]
+            try:
+                count = analytics_store.import_comments_file(video_id, file_name)
+                logger.info(f"Backfilled {count} comments for video {video_id} from {file_name}")
+            except Exception as e:
+                logger.warning(f"Failed to backfill comments from {file_name}: {str(e)}")
+
+def main(video_ids, output_format='csv', backfill_dir=None):
+    if backfill_dir:
+        backfill_comments(backfill_dir)
     for video_id in video_ids:
         process_video(video_id, output_format)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="YouTube SEO Analysis Pipeline")
-    parser.add_argument("video_ids", nargs="+", help="YouTube video IDs to analyze")
+    parser.add_argument("video_ids", nargs="*", help="YouTube video IDs to analyze")
     parser.add_argument("--output", choices=['csv', 'json'], default='csv', help="Output format for comments data")
+    parser.add_argument("--backfill-dir", help="Directory of existing *_YouTube_Comments files to import into the analytics store")
     args = parser.parse_args()
+    if not args.video_ids and not args.backfill_dir:
+        parser.error("provide at least one video ID or --backfill-dir")
 
-    main(args.video_ids, args.output)
\ No newline at end of file
+    main(args.video_ids, args.output, args.backfill_dir)
\ No newline at end of file
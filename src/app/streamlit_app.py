@@ -5,13 +5,6 @@ from wordcloud import WordCloud
 import os
 import sys
 from dotenv import load_dotenv
-from io import BytesIO
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph, SimpleDocTemplate
 
 # Add the project root to the Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -21,6 +14,8 @@ from src.etl.youtube_api import YouTubeAPI
 from src.etl.s3_upload import S3Uploader
 from src.ml.openai_integration import OpenAIAnalyzer
 from src.ml.seo_suggestions import SEOSuggestions
+from src.storage.analytics_store import AnalyticsStore
+from src.reports.pdf_export import render_report_pdf, export_reports_zip, report_hash
 from run import process_video
 
 # Load environment variables
@@ -31,21 +26,6 @@ s3_bucket = os.getenv("S3_BUCKET")
 openai_key = os.getenv("OPENAI_API_KEY")
 youtube_api_key = os.getenv("DEVELOPER_KEY")
 
-# PDF Generation Function
-def generate_pdf(content):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    flowables = []
-
-    for line in content.split('\n'):
-        para = Paragraph(line, styles['Normal'])
-        flowables.append(para)
-
-    doc.build(flowables)
-    buffer.seek(0)
-    return buffer
-
 # Initialize components with error handling
 try:
     if not youtube_api_key:
@@ -69,14 +49,26 @@ except Exception as e:
     st.error(f"Unexpected error initializing components: {str(e)}")
     st.stop()
 
+# The analytics store is optional; without it the dashboard uses in-memory results
+analytics_store_error = None
+try:
+    analytics_store = AnalyticsStore(sentiment_counter=SEOSuggestions.sentiment_counts)
+except Exception as e:
+    analytics_store = None
+    analytics_store_error = str(e)
+
 # Streamlit app
 st.set_page_config(page_title="YouTube SEO Analyzer", layout="wide")
+if analytics_store_error:
+    st.warning(f"Analytics store unavailable, engagement history is disabled: {analytics_store_error}")
 
 # Session state
 if 'video_ids' not in st.session_state:
     st.session_state['video_ids'] = []
 if 'analysis_results' not in st.session_state:
     st.session_state['analysis_results'] = {}
+if 'prepared_reports' not in st.session_state:
+    st.session_state['prepared_reports'] = set()
 
 # Sidebar
 st.sidebar.title("YouTube SEO Analyzer")
@@ -143,40 +135,105 @@ if st.session_state['analysis_results']:
         ax.axis('off')
         st.pyplot(fig)
         
+        # Engagement over time, queried from the analytics store
+        if analytics_store is not None:
+            st.subheader("Engagement Over Time")
+            velocity_df = analytics_store.comment_velocity(video_id=video_id)
+            if not velocity_df.empty:
+                st.line_chart(velocity_df.set_index('day')[['comments', 'comment_likes']])
+                likes_df = analytics_store.likes_per_day(video_id=video_id)
+                if len(likes_df) > 1:
+                    st.line_chart(likes_df.set_index('day')[['likes', 'new_likes']])
+                else:
+                    st.caption("Likes per day appear once details snapshots from two different days are recorded.")
+                sentiment_df = analytics_store.sentiment_drift(video_id=video_id)
+                if not sentiment_df.empty:
+                    st.line_chart(sentiment_df.set_index('day')[['sentiment', 'cumulative_sentiment']])
+            else:
+                st.info("No comment history recorded for this video yet.")
+        
         # SEO Report
         st.subheader("SEO Analysis Report")
         if 'seo_report' in results and results['seo_report']:
             st.markdown(results['seo_report'])
             
-            # Generate PDF
-            pdf_buffer = generate_pdf(results['seo_report'])
-            
-            # Download button for SEO report
-            st.download_button(
-                label="Download SEO Report",
-                data=pdf_buffer,
-                file_name=f"SEO_Report_{results['details']['title']}.pdf",
-                mime="application/pdf"
-            )
+            # Render the PDF only once a download is requested; output is cached by report hash
+            report_key = report_hash(results['seo_report'])
+            if report_key not in st.session_state['prepared_reports']:
+                if st.button("Prepare SEO Report PDF", key=f"prepare_{video_id}"):
+                    st.session_state['prepared_reports'].add(report_key)
+            if report_key in st.session_state['prepared_reports']:
+                st.download_button(
+                    label="Download SEO Report",
+                    data=render_report_pdf(results['seo_report']),
+                    file_name=f"SEO_Report_{results['details']['title']}.pdf",
+                    mime="application/pdf",
+                    key=f"download_{video_id}"
+                )
         else:
             st.warning("SEO report not found for this video. Please click 'Re-Analyze All Videos' to generate the report.")
 
+# Bulk export of all SEO reports
+reports_to_export = {
+    f"SEO_Report_{results['details']['title']}_{video_id}": results['seo_report']
+    for video_id, results in st.session_state['analysis_results'].items()
+    if results.get('seo_report')
+}
+# The zip is tied to the exact reports it was built from, so adding,
+# re-analyzing or clearing videos drops a stale archive.
+export_key = frozenset(report_hash(content) for content in reports_to_export.values())
+if st.session_state.get('reports_zip') and st.session_state['reports_zip'][0] != export_key:
+    st.session_state['reports_zip'] = None
+if len(reports_to_export) > 1 and st.button("Export All Reports"):
+    with st.spinner("Rendering SEO reports..."):
+        st.session_state['reports_zip'] = (export_key, export_reports_zip(reports_to_export))
+if st.session_state.get('reports_zip'):
+    st.download_button(
+        label="Download All Reports (ZIP)",
+        data=st.session_state['reports_zip'][1],
+        file_name="SEO_Reports.zip",
+        mime="application/zip"
+    )
+
 # Comparison feature
 if len(st.session_state['video_ids']) > 1:
     st.header("Video Comparison")
     video_titles = {video_id: results['details']['title'] for video_id, results in st.session_state['analysis_results'].items()}
     videos_to_compare = st.multiselect("Select videos to compare", options=list(video_titles.keys()), format_func=lambda x: video_titles[x])
     if len(videos_to_compare) > 1:
+        summary_df = pd.DataFrame()
+        if analytics_store is not None:
+            try:
+                summary_df = analytics_store.video_summary(videos_to_compare).set_index('video_id')
+            except Exception as e:
+                st.warning(f"Could not query the analytics store: {str(e)}")
+
         comparison_data = []
+        missing_titles = []
         for video_id in videos_to_compare:
-            results = st.session_state['analysis_results'][video_id]
-            comparison_data.append({
-                'Video Title': results['details']['title'],
-                'Views': results['details']['views'],
-                'Likes': results['details']['likes'],
-                'Comments': len(results['comments']),
-                'Sentiment': seo_generator.analyze_sentiment(" ".join(results['comments']['textDisplay']))
-            })
+            if video_id in summary_df.index and pd.notna(summary_df.loc[video_id, 'views']):
+                summary = summary_df.loc[video_id]
+                comparison_data.append({
+                    'Video Title': summary['title'],
+                    'Views': int(summary['views']),
+                    'Likes': int(summary['likes']),
+                    'Comments': int(summary['comments']),
+                    'Sentiment': SEOSuggestions.sentiment_label(summary['sentiment'] if pd.notna(summary['sentiment']) else 0)
+                })
+            else:
+                # Fall back to the in-memory results when the store has no record of this video
+                results = st.session_state['analysis_results'][video_id]
+                if analytics_store is not None:
+                    missing_titles.append(results['details']['title'])
+                comparison_data.append({
+                    'Video Title': results['details']['title'],
+                    'Views': int(results['details']['views']),
+                    'Likes': int(results['details']['likes']),
+                    'Comments': len(results['comments']),
+                    'Sentiment': seo_generator.analyze_sentiment(" ".join(results['comments']['textDisplay']))
+                })
+        if missing_titles:
+            st.warning(f"Not found in the analytics store, showing session data instead: {', '.join(missing_titles)}")
         comparison_df = pd.DataFrame(comparison_data)
         st.table(comparison_df)
 
@@ -193,4 +250,6 @@ if len(st.session_state['video_ids']) > 1:
 if st.button("Clear All Data"):
     st.session_state['video_ids'] = []
     st.session_state['analysis_results'] = {}
+    st.session_state['prepared_reports'] = set()
+    st.session_state['reports_zip'] = None
     st.success("All data has been cleared.")
\ No newline at end of file
@@ -46,6 +46,7 @@ class YouTubeAPI:
                 for item in response.get('items', []):
                     comment = item['snippet']['topLevelComment']['snippet']
                     comments.append({
+                        'commentId': item['snippet']['topLevelComment'].get('id', item.get('id')),
                         'channelId': comment.get('authorChannelId', {}).get('value', 'Unknown'),
                         'textDisplay': comment.get('textDisplay', ''),
                         'likeCount': comment.get('likeCount', 0),
@@ -77,6 +78,8 @@ class YouTubeAPI:
                 video = response['items'][0]
                 return {
                     'title': video['snippet'].get('title', ''),
+                    'channelId': video['snippet'].get('channelId', ''),
+                    'channelTitle': video['snippet'].get('channelTitle', ''),
                     'views': video['statistics'].get('viewCount', 0),
                     'likes': video['statistics'].get('likeCount', 0),
                     'dislikes': video['statistics'].get('dislikeCount', 0),
@@ -5,6 +5,19 @@ from collections import Counter
 import logging
 from functools import lru_cache
 
+
+@lru_cache(maxsize=1)
+def _tokenizer_available():
+    # Checked once per process so per-comment scoring does not raise and log
+    # for every comment when the NLTK tokenizer data is missing.
+    try:
+        word_tokenize("probe")
+        return True
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"NLTK tokenizer unavailable: {e}. Falling back to simple split.")
+        return False
+
+
 class SEOSuggestions:
     def __init__(self, openai_analyzer):
         self.openai_analyzer = openai_analyzer
@@ -12,6 +25,7 @@ class SEOSuggestions:
         
         try:
             nltk.download('punkt', quiet=True)
+            nltk.download('punkt_tab', quiet=True)
             nltk.download('stopwords', quiet=True)
             self.stop_words = set(stopwords.words('english'))
         except Exception as e:
@@ -33,22 +47,28 @@ class SEOSuggestions:
         word_freq = Counter(words)
         return word_freq.most_common(top_n)
 
-    def analyze_sentiment(self, comments_text):
+    @staticmethod
+    def sentiment_counts(comments_text):
         positive_words = set(['good', 'great', 'excellent', 'amazing', 'love', 'best'])
         negative_words = set(['bad', 'poor', 'terrible', 'worst', 'hate', 'awful'])
         
-        try:
+        if _tokenizer_available():
             words = word_tokenize(comments_text.lower())
-        except Exception as e:
-            self.logger.warning(f"Error in tokenization: {e}. Falling back to simple split.")
+        else:
             words = comments_text.lower().split()
         
         positive_count = sum(1 for word in words if word in positive_words)
         negative_count = sum(1 for word in words if word in negative_words)
         
-        total_words = len(words)
-        sentiment_score = (positive_count - negative_count) / total_words if total_words > 0 else 0
-        
+        return positive_count, negative_count, len(words)
+
+    @staticmethod
+    def sentiment_score(comments_text):
+        positive_count, negative_count, total_words = SEOSuggestions.sentiment_counts(comments_text)
+        return (positive_count - negative_count) / total_words if total_words > 0 else 0
+
+    @staticmethod
+    def sentiment_label(sentiment_score):
         if sentiment_score > 0.05:
             return "Positive"
         elif sentiment_score < -0.05:
@@ -56,6 +76,9 @@ class SEOSuggestions:
         else:
             return "Neutral"
 
+    def analyze_sentiment(self, comments_text):
+        return self.sentiment_label(self.sentiment_score(comments_text))
+
     def comprehensive_analysis(self, comments_text):
         keywords = self.extract_keywords(comments_text)
         sentiment = self.analyze_sentiment(comments_text)
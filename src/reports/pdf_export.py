@@ -0,0 +1,188 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.fonts import addMapping
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+FONT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app'))
+FONT_NAME = "DejaVuSans"
+FONT_PATH = os.path.join(FONT_DIR, 'DejaVuSans.ttf')
+BOLD_FONT_NAME = "DejaVuSans-Bold"
+BOLD_FONT_PATH = os.path.join(FONT_DIR, 'DejaVuSans-Bold.ttf')
+FALLBACK_FONT_NAME = "Helvetica"
+CACHE_SIZE = 64
+# Rendering one report takes tens of milliseconds while starting a spawned
+# worker pool takes most of a second, so only large batches are parallelised.
+PARALLEL_THRESHOLD = 64
+
+logger = logging.getLogger(__name__)
+
+_font_lock = threading.Lock()
+_font_name = None
+_styles = None
+
+_cache_lock = threading.Lock()
+_pdf_cache = OrderedDict()
+
+_BOLD_PATTERN = re.compile(r'\*\*(.+?)\*\*')
+_HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*)$')
+_LIST_ITEM_PATTERN = re.compile(r'^(?:([-*])|(\d+\.))\s+(.*)$')
+
+
+def register_font():
+    """Register the bundled Unicode font once per process and return its name."""
+    global _font_name, _styles
+    if _font_name is not None:
+        return _font_name
+    with _font_lock:
+        if _font_name is None:
+            try:
+                pdfmetrics.registerFont(TTFont(FONT_NAME, FONT_PATH))
+                pdfmetrics.registerFont(TTFont(BOLD_FONT_NAME, BOLD_FONT_PATH))
+                # Map <b> markup in paragraphs to the bold face
+                addMapping(FONT_NAME, 0, 0, FONT_NAME)
+                addMapping(FONT_NAME, 1, 0, BOLD_FONT_NAME)
+                addMapping(FONT_NAME, 0, 1, FONT_NAME)
+                addMapping(FONT_NAME, 1, 1, BOLD_FONT_NAME)
+                font_name = FONT_NAME
+            except Exception as e:
+                logger.warning(f"Failed to register font {FONT_PATH}: {e}. Falling back to {FALLBACK_FONT_NAME}.")
+                font_name = FALLBACK_FONT_NAME
+            _styles = _build_styles(font_name)
+            _font_name = font_name
+    return _font_name
+
+
+def _build_styles(font_name):
+    base = getSampleStyleSheet()
+    styles = {'Normal': ParagraphStyle('ReportNormal', parent=base['Normal'], fontName=font_name)}
+    for level in range(1, 7):
+        styles[f'Heading{level}'] = ParagraphStyle(
+            f'ReportHeading{level}', parent=base[f'Heading{level}'], fontName=font_name
+        )
+    return styles
+
+
+def report_hash(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _inline_markup(text):
+    return _BOLD_PATTERN.sub(r'<b>\1</b>', escape(text))
+
+
+def _markdown_flowables(content, styles):
+    # One flowable per line, as in the original report layout.
+    flowables = []
+    for raw_line in content.splitlines():
+        line = raw_line.strip()
+        if not line:
+            flowables.append(Spacer(1, 6))
+            continue
+        heading = _HEADING_PATTERN.match(line)
+        list_item = _LIST_ITEM_PATTERN.match(line)
+        if heading:
+            level = len(heading.group(1))
+            flowables.append(Paragraph(_inline_markup(heading.group(2)), styles[f'Heading{level}']))
+        elif list_item:
+            bullet = '•' if list_item.group(1) else list_item.group(2)
+            flowables.append(Paragraph(_inline_markup(list_item.group(3)), styles['Normal'], bulletText=bullet))
+        else:
+            flowables.append(Paragraph(_inline_markup(line), styles['Normal']))
+    return flowables
+
+
+def _render(content):
+    register_font()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    doc.build(_markdown_flowables(content, _styles))
+    return buffer.getvalue()
+
+
+def _cache_get(key):
+    with _cache_lock:
+        pdf_bytes = _pdf_cache.get(key)
+        if pdf_bytes is not None:
+            _pdf_cache.move_to_end(key)
+        return pdf_bytes
+
+
+def _cache_put(key, pdf_bytes):
+    with _cache_lock:
+        _pdf_cache[key] = pdf_bytes
+        _pdf_cache.move_to_end(key)
+        while len(_pdf_cache) > CACHE_SIZE:
+            _pdf_cache.popitem(last=False)
+
+
+def render_report_pdf(content):
+    """Render a markdown report to PDF bytes, reusing cached output for identical reports."""
+    key = report_hash(content)
+    pdf_bytes = _cache_get(key)
+    if pdf_bytes is None:
+        pdf_bytes = _render(content)
+        _cache_put(key, pdf_bytes)
+    return pdf_bytes
+
+
+def safe_file_name(name):
+    return re.sub(r'[^\w\-. ]+', '_', name).strip() or "report"
+
+
+def export_reports_zip(reports):
+    """Render many reports and bundle them into a zip archive.
+
+    ``reports`` maps a file name (without extension) to markdown report content.
+    Uncached reports are rendered in worker processes once there are at least
+    ``PARALLEL_THRESHOLD`` of them.
+    """
+    pending = {}
+    rendered = {}
+    for name, content in reports.items():
+        pdf_bytes = _cache_get(report_hash(content))
+        if pdf_bytes is None:
+            pending[name] = content
+        else:
+            rendered[name] = pdf_bytes
+
+    if len(pending) >= PARALLEL_THRESHOLD and (os.cpu_count() or 1) > 1:
+        # Workers are spawned, not forked: forking the multithreaded Streamlit
+        # server could copy a lock held by another thread. The pool only lives
+        # for this export.
+        max_workers = min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            for name, pdf_bytes in zip(pending, executor.map(_render, pending.values())):
+                rendered[name] = pdf_bytes
+                _cache_put(report_hash(pending[name]), pdf_bytes)
+    else:
+        for name, content in pending.items():
+            rendered[name] = render_report_pdf(content)
+
+    buffer = BytesIO()
+    used_names = set()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name in reports:
+            base_name = safe_file_name(name)
+            file_name = f"{base_name}.pdf"
+            suffix = 1
+            while file_name in used_names:
+                suffix += 1
+                file_name = f"{base_name}_{suffix}.pdf"
+            used_names.add(file_name)
+            archive.writestr(file_name, rendered[name])
+    return buffer.getvalue()
@@ -0,0 +1,263 @@
+import hashlib
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, 'youtube_analytics.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    channel_id TEXT,
+    channel_title TEXT,
+    title TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_videos_channel ON videos (channel_id);
+
+CREATE TABLE IF NOT EXISTS video_snapshots (
+    video_id TEXT NOT NULL,
+    captured_at TEXT NOT NULL,
+    views INTEGER,
+    likes INTEGER,
+    comment_count INTEGER,
+    PRIMARY KEY (video_id, captured_at)
+);
+
+CREATE TABLE IF NOT EXISTS comments (
+    video_id TEXT NOT NULL,
+    comment_id TEXT NOT NULL,
+    author_channel_id TEXT,
+    text TEXT,
+    like_count INTEGER,
+    published_at TEXT,
+    updated_at TEXT,
+    positive_words INTEGER,
+    negative_words INTEGER,
+    total_words INTEGER,
+    first_seen_at TEXT NOT NULL,
+    last_seen_at TEXT NOT NULL,
+    PRIMARY KEY (video_id, comment_id)
+);
+CREATE INDEX IF NOT EXISTS idx_comments_video_published ON comments (video_id, published_at);
+"""
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _utc_now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class AnalyticsStore:
+    """Local SQLite store for video detail snapshots and comment history.
+
+    ``sentiment_counter`` maps comment text to ``(positive, negative, total)``
+    word counts; ratios are computed from their sums at query time so they
+    agree with the score of the concatenated comments.
+    """
+
+    def __init__(self, db_path=None, sentiment_counter=None):
+        self.db_path = db_path or os.getenv("ANALYTICS_DB_PATH", DEFAULT_DB_PATH)
+        self.sentiment_counter = sentiment_counter
+        self.logger = logging.getLogger(__name__)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation keeps the store usable from
+        # Streamlit's per-session threads without sharing sqlite3 handles.
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record_video(self, video_id, video_details, captured_at=None):
+        if not video_details:
+            self.logger.warning(f"No video details to record for {video_id}")
+            return
+        captured_at = captured_at or _utc_now()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO videos (video_id, channel_id, channel_title, title)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (video_id) DO UPDATE SET
+                    channel_id = excluded.channel_id,
+                    channel_title = excluded.channel_title,
+                    title = excluded.title
+                """,
+                (video_id, video_details.get('channelId'), video_details.get('channelTitle'),
+                 video_details.get('title')),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO video_snapshots VALUES (?, ?, ?, ?, ?)",
+                (video_id, captured_at, _to_int(video_details.get('views')),
+                 _to_int(video_details.get('likes')), _to_int(video_details.get('comments'))),
+            )
+        self.logger.info(f"Recorded details snapshot for video {video_id}")
+
+    def record_comments(self, video_id, comments_df, seen_at=None):
+        if comments_df is None or comments_df.empty:
+            return 0
+        seen_at = seen_at or _utc_now()
+        with self._connect() as conn:
+            stored_texts = dict(conn.execute(
+                "SELECT comment_id, text FROM comments WHERE video_id = ? AND total_words IS NOT NULL",
+                (video_id,),
+            ))
+
+        # Files written by earlier runs load empty cells as NaN; treat them as missing.
+        comments_df = comments_df.astype(object).where(comments_df.notna(), None)
+        rows = []
+        for comment in comments_df.to_dict('records'):
+            text = comment.get('textDisplay') or ''
+            comment_id = comment.get('commentId')
+            if not isinstance(comment_id, str) or not comment_id:
+                # Older exports have no comment ID; derive a stable one instead.
+                key = f"{comment.get('channelId')}|{comment.get('publishedAt')}|{text}"
+                comment_id = hashlib.sha1(key.encode('utf-8')).hexdigest()
+            # Only score comments that are new or edited; stored counts are kept otherwise.
+            if self.sentiment_counter and stored_texts.get(comment_id) != text:
+                counts = self.sentiment_counter(text)
+            else:
+                counts = (None, None, None)
+            rows.append((
+                video_id, comment_id, comment.get('channelId'), text,
+                _to_int(comment.get('likeCount')), comment.get('publishedAt'),
+                comment.get('updatedAt'), *counts, seen_at, seen_at,
+            ))
+
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO comments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (video_id, comment_id) DO UPDATE SET
+                    text = excluded.text,
+                    like_count = excluded.like_count,
+                    updated_at = excluded.updated_at,
+                    positive_words = COALESCE(excluded.positive_words, comments.positive_words),
+                    negative_words = COALESCE(excluded.negative_words, comments.negative_words),
+                    total_words = COALESCE(excluded.total_words, comments.total_words),
+                    last_seen_at = excluded.last_seen_at
+                WHERE excluded.last_seen_at >= comments.last_seen_at
+                """,
+                rows,
+            )
+        self.logger.info(f"Recorded {len(rows)} comments for video {video_id}")
+        return len(rows)
+
+    def import_comments_file(self, video_id, file_name):
+        if file_name.endswith('.json'):
+            comments_df = pd.read_json(file_name, orient='records')
+        else:
+            comments_df = pd.read_csv(file_name)
+        # The file was written when its comments were fetched, so that is when they were seen.
+        modified_at = datetime.fromtimestamp(os.path.getmtime(file_name), timezone.utc)
+        return self.record_comments(video_id, comments_df, seen_at=modified_at.isoformat(timespec='seconds'))
+
+    def _scope(self, alias, video_id, channel_id):
+        if video_id:
+            return f"{alias}.video_id = ?", [video_id]
+        if channel_id:
+            return f"{alias}.video_id IN (SELECT video_id FROM videos WHERE channel_id = ?)", [channel_id]
+        raise ValueError("Either video_id or channel_id is required.")
+
+    def _query(self, sql, params):
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def comment_velocity(self, video_id=None, channel_id=None):
+        where, params = self._scope('c', video_id, channel_id)
+        return self._query(
+            f"""
+            SELECT substr(c.published_at, 1, 10) AS day,
+                   COUNT(*) AS comments,
+                   SUM(COUNT(*)) OVER (ORDER BY substr(c.published_at, 1, 10)) AS cumulative_comments,
+                   SUM(c.like_count) AS comment_likes
+            FROM comments c
+            WHERE {where}
+            GROUP BY day
+            ORDER BY day
+            """,
+            params,
+        )
+
+    def likes_per_day(self, video_id=None, channel_id=None):
+        where, params = self._scope('s', video_id, channel_id)
+        return self._query(
+            f"""
+            WITH daily AS (
+                SELECT s.video_id, substr(s.captured_at, 1, 10) AS day,
+                       MAX(s.views) AS views, MAX(s.likes) AS likes
+                FROM video_snapshots s
+                WHERE {where}
+                GROUP BY s.video_id, day
+            )
+            SELECT day,
+                   SUM(views) AS views,
+                   SUM(likes) AS likes,
+                   SUM(likes - COALESCE(prev_likes, likes)) AS new_likes
+            FROM (
+                SELECT daily.*,
+                       LAG(likes) OVER (PARTITION BY video_id ORDER BY day) AS prev_likes
+                FROM daily
+            )
+            GROUP BY day
+            ORDER BY day
+            """,
+            params,
+        )
+
+    def sentiment_drift(self, video_id=None, channel_id=None):
+        where, params = self._scope('c', video_id, channel_id)
+        return self._query(
+            f"""
+            SELECT substr(c.published_at, 1, 10) AS day,
+                   CAST(SUM(c.positive_words - c.negative_words) AS REAL)
+                       / NULLIF(SUM(c.total_words), 0) AS sentiment,
+                   CAST(SUM(SUM(c.positive_words - c.negative_words)) OVER w AS REAL)
+                       / NULLIF(SUM(SUM(c.total_words)) OVER w, 0) AS cumulative_sentiment
+            FROM comments c
+            WHERE {where} AND c.total_words IS NOT NULL
+            GROUP BY day
+            WINDOW w AS (ORDER BY substr(c.published_at, 1, 10))
+            ORDER BY day
+            """,
+            params,
+        )
+
+    def video_summary(self, video_ids):
+        if not video_ids:
+            return pd.DataFrame(columns=['video_id', 'title', 'views', 'likes', 'comments', 'sentiment'])
+        placeholders = ", ".join("?" for _ in video_ids)
+        return self._query(
+            f"""
+            SELECT v.video_id, v.title, s.views, s.likes,
+                   (SELECT COUNT(*) FROM comments c
+                    WHERE c.video_id = v.video_id
+                      AND c.last_seen_at = (SELECT MAX(last_seen_at) FROM comments WHERE video_id = v.video_id)
+                   ) AS comments,
+                   (SELECT CAST(SUM(c.positive_words - c.negative_words) AS REAL) / NULLIF(SUM(c.total_words), 0)
+                    FROM comments c WHERE c.video_id = v.video_id) AS sentiment
+            FROM videos v
+            LEFT JOIN video_snapshots s
+                ON s.video_id = v.video_id
+               AND s.captured_at = (SELECT MAX(captured_at) FROM video_snapshots WHERE video_id = v.video_id)
+            WHERE v.video_id IN ({placeholders})
+            """,
+            list(video_ids),
+        )